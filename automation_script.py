@@ -4,37 +4,122 @@
 import os
 import sys
 import time
-import schedule
-import subprocess
-import json
+import bisect
+import orjson
 import pandas as pd
+import duckdb
 import sqlite3
 from datetime import datetime, timedelta
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import logging
+import logging.handlers
+import queue
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import closing, contextmanager
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.executors.pool import ThreadPoolExecutor as SchedulerThreadPool
 
 # Import our custom ETL class
 from sales_etl_pipeline import SalesDataETL
+from sales_db import (
+    CONFIG_FILE, DEFAULT_DATABASE_PATH, SQLITE_PRAGMAS, SQLITE_CACHED_STATEMENTS, connect_readonly
+)
+from report_stream import KPI_QUERIES, DUCKDB_KPI_QUERIES, render_report
+
+# Today's transaction count and max amount plus the latest transaction date,
+# fetched in one round-trip; binding the day bounds against the raw column keeps
+# the range an index seek on idx_transaction_date
+QUALITY_QUERY = """
+    SELECT today.daily_count, today.max_amount,
+           (SELECT MAX(transaction_date) FROM sales_transactions)
+    FROM (
+        SELECT COUNT(*) AS daily_count, MAX(total_amount) AS max_amount
+        FROM sales_transactions
+        WHERE transaction_date >= ? AND transaction_date < ?
+    ) AS today
+"""
+
+# (row count, latest transaction date) fingerprint of the fact table. Separate
+# subqueries so MAX is a single index seek and COUNT walks the index, not the table
+KPI_SIGNATURE_QUERY = """
+    SELECT (SELECT COUNT(*) FROM sales_transactions),
+           (SELECT MAX(transaction_date) FROM sales_transactions)
+"""
+
+def duckdb_frame(result):
+    """Fetch a DuckDB result as a DataFrame with the integer columns SQLite would return"""
+    # DuckDB sums integers into HUGEINT, which pandas receives as float64
+    hugeint = [column[0] for column in result.description if column[1] == 'HUGEINT']
+    df = result.fetch_df()
+    return df.astype({column: 'int64' for column in hugeint if df[column].notna().all()})
+
+# Set once DuckDB has failed to load its sqlite extension, so later KPI runs go
+# straight to SQLite instead of retrying
+_duckdb_sqlite_unavailable = False
+
+# Worker threads for concurrently scheduled tasks, and read-only connections in the pool
+MAINTENANCE_WORKERS = 3
+
+# APScheduler interval arguments for each supported schedule frequency
+SCHEDULE_INTERVALS = {
+    "hourly": {"hours": 1},
+    "daily": {"days": 1},
+    "weekly": {"weeks": 1}
+}
+
+# Maintenance tasks and the schedule setting giving their frequency. Tasks that
+# share a frequency are submitted together on one tick; the ETL writer always
+# runs as its own job so a backup never captures a half-loaded database
+MAINTENANCE_TASKS = {
+    'create_backup': 'backup_frequency',
+    'validate_data_quality': 'backup_frequency',
+    'generate_performance_report': 'report_frequency'
+}
+
+# Manager that persisted scheduler jobs dispatch to (set by start_scheduler)
+_manager = None
+
+def run_scheduled_tasks(task_names):
+    """Scheduler entry point: run a tick's tasks on the active manager"""
+    _manager.run_maintenance(task_names)
 
 class SalesAutomationManager:
     """
     Comprehensive automation manager for sales data pipeline
     """
     
-    def __init__(self, config_file='config.json'):
+    def __init__(self, config_file=CONFIG_FILE):
         self.config = self.load_config(config_file)
         self.setup_logging()
-        self.etl = SalesDataETL(self.config.get('database_path', 'sales_data.db'))
+        self.etl = SalesDataETL(self.config['database_path'])
+        self.ensure_schema()
+        
+        # Long-lived read-only connections, one per concurrently running task
+        self._ro_pool = queue.Queue()
+        for _ in range(MAINTENANCE_WORKERS):
+            self._ro_pool.put(self._connect(readonly=True))
+        
+        self._pool = ThreadPoolExecutor(max_workers=MAINTENANCE_WORKERS)
+        
+        self.scheduler = None
+        
+        # Latest (data signature, KPI results) and ((hour, data signature), report);
+        # both are dropped after every ETL run
+        self._kpi_cache = None
+        self._report_cache = None
         
     def load_config(self, config_file):
         """Load configuration from JSON file"""
         default_config = {
-            "database_path": "sales_data.db",
+            "database_path": DEFAULT_DATABASE_PATH,
             "backup_path": "backups/",
             "log_path": "logs/",
+            "report_path": "reports/",
+            "scheduler_jobstore_url": "sqlite:///scheduler_jobs.db",
             "email_alerts": {
                 "enabled": False,
                 "smtp_server": "smtp.gmail.com",
@@ -61,15 +146,22 @@ class SalesAutomationManager:
         }
         
         try:
-            if os.path.exists(config_file):
-                with open(config_file, 'r') as f:
-                    user_config = json.load(f)
-                    default_config.update(user_config)
-            else:
-                # Create default config file
-                with open(config_file, 'w') as f:
-                    json.dump(default_config, f, indent=2)
-                    
+            user_config = orjson.loads(Path(config_file).read_bytes())
+            default_config.update(user_config)
+                
+        except FileNotFoundError:
+            # Create default config file; O_EXCL makes creation atomic when
+            # several workers start at once
+            try:
+                fd = os.open(config_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(orjson.dumps(default_config, option=orjson.OPT_INDENT_2))
+            except FileExistsError:
+                # Another worker created it first with these same defaults
+                pass
+            except Exception as e:
+                print(f"Error creating config: {e}. Using defaults.")
+                
         except Exception as e:
             print(f"Error loading config: {e}. Using defaults.")
             
@@ -82,16 +174,86 @@ class SalesAutomationManager:
         
         log_file = log_dir / f"sales_automation_{datetime.now().strftime('%Y%m%d')}.log"
         
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler(sys.stdout)
-            ]
+        formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
         )
+        file_handler = logging.FileHandler(log_file)
+        console_handler = logging.StreamHandler(sys.stdout)
+        for handler in (file_handler, console_handler):
+            handler.setFormatter(formatter)
+        
+        # Callers only enqueue records; a background listener formats and writes
+        # them so file/console I/O stays off the ETL and scheduler threads
+        log_queue = queue.Queue(-1)
+        self._log_listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler)
+        self._log_listener.start()
+        
+        # The queue carries the bare message; the listener's handlers apply the real format
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.setFormatter(logging.Formatter('%(message)s'))
+        
+        logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
         self.logger = logging.getLogger('SalesAutomation')
     
+    def _connect(self, readonly=False):
+        """Open a SQLite connection with the standard PRAGMAs applied"""
+        db_path = self.config['database_path']
+        
+        if readonly:
+            # Read-only handles are pooled and handed to whichever worker thread needs one
+            conn = connect_readonly(db_path)
+        else:
+            # Autocommit mode; writers open their own transactions explicitly
+            conn = sqlite3.connect(
+                db_path, isolation_level=None, cached_statements=SQLITE_CACHED_STATEMENTS
+            )
+            conn.executescript("PRAGMA journal_mode=WAL;" + SQLITE_PRAGMAS)
+            
+        return conn
+    
+    @contextmanager
+    def _reader(self):
+        """Borrow a read-only connection from the pool"""
+        conn = self._ro_pool.get()
+        try:
+            yield conn
+        finally:
+            self._ro_pool.put(conn)
+    
+    @contextmanager
+    def _write_transaction(self):
+        """Yield a writer connection inside a BEGIN IMMEDIATE transaction"""
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+    
+    def ensure_schema(self):
+        """Create the index used by the data quality checks"""
+        try:
+            with self._write_transaction() as conn:
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_transaction_date ON sales_transactions(transaction_date)"
+                )
+                # Superseded by idx_transaction_date
+                conn.execute("DROP INDEX IF EXISTS idx_tx_date")
+                
+                # Earlier versions added a generated tx_epoch column; remove it so
+                # the ETL's table keeps its own shape
+                columns = {row[1] for row in conn.execute("PRAGMA table_xinfo(sales_transactions)")}
+                if 'tx_epoch' in columns:
+                    conn.execute("DROP INDEX IF EXISTS idx_tx_epoch")
+                    conn.execute("ALTER TABLE sales_transactions DROP COLUMN tx_epoch")
+                
+        except sqlite3.OperationalError as e:
+            # The table does not exist until the first ETL run has loaded data
+            self.logger.warning(f"Could not prepare quality-check schema: {str(e)}")
+    
     def create_backup(self):
         """Create database backup"""
         try:
@@ -101,18 +263,24 @@ class SalesAutomationManager:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             backup_file = backup_dir / f"sales_backup_{timestamp}.db"
             
-            # Copy database file
-            import shutil
-            shutil.copy2(self.config['database_path'], backup_file)
+            # Online backup API: consistent under concurrent writes and WAL, copied in
+            # steps so the writer is not blocked for the whole backup
+            with closing(self._connect(readonly=True)) as src, closing(sqlite3.connect(backup_file)) as dst:
+                src.backup(dst, pages=1000, sleep=0.05)
             
             self.logger.info(f"Database backup created: {backup_file}")
             
-            # Cleanup old backups (keep last 7 days)
-            cutoff_date = datetime.now() - timedelta(days=7)
-            for backup in backup_dir.glob("sales_backup_*.db"):
-                if backup.stat().st_mtime < cutoff_date.timestamp():
-                    backup.unlink()
-                    self.logger.info(f"Removed old backup: {backup}")
+            # Cleanup old backups (keep last 7 days). Names embed a fixed-width
+            # timestamp, so sorted names are chronological and age is a string compare
+            cutoff_name = f"sales_backup_{(datetime.now() - timedelta(days=7)).strftime('%Y%m%d_%H%M%S')}.db"
+            backups = sorted(
+                name for name in os.listdir(backup_dir)
+                if name.startswith("sales_backup_") and name.endswith(".db")
+            )
+            
+            for name in backups[:bisect.bisect_left(backups, cutoff_name)]:
+                os.unlink(backup_dir / name)
+                self.logger.info(f"Removed old backup: {backup_dir / name}")
                     
         except Exception as e:
             self.logger.error(f"Backup failed: {str(e)}")
@@ -123,52 +291,47 @@ class SalesAutomationManager:
         quality_issues = []
         
         try:
-            with sqlite3.connect(self.config['database_path']) as conn:
-                # Check transaction count
-                today = datetime.now().strftime('%Y-%m-%d')
-                result = pd.read_sql(
-                    "SELECT COUNT(*) as count FROM sales_transactions WHERE DATE(transaction_date) = ?",
-                    conn, params=[today]
-                )
-                
-                daily_count = result.iloc[0]['count']
-                min_threshold = self.config['quality_thresholds']['min_daily_transactions']
-                
-                if daily_count < min_threshold:
-                    issue = f"Low transaction count today: {daily_count} (expected: >{min_threshold})"
-                    quality_issues.append(issue)
-                    self.logger.warning(issue)
-                
-                # Check for anomalous transaction amounts
-                result = pd.read_sql(
-                    "SELECT MAX(total_amount) as max_amount FROM sales_transactions WHERE DATE(transaction_date) = ?",
-                    conn, params=[today]
-                )
-                
-                max_amount = result.iloc[0]['max_amount'] or 0
-                max_threshold = self.config['quality_thresholds']['max_transaction_amount']
+            # Today's bounds as ISO date strings, which sort like the stored dates
+            today = datetime.now().date()
+            day_start = today.isoformat()
+            day_end = (today + timedelta(days=1)).isoformat()
+            
+            # The pooled connections are long-lived, so this reuses the statement
+            # SQLite prepared on the previous run instead of re-parsing it
+            with self._reader() as conn:
+                # Fetch today's count, today's max amount and the latest date in one round-trip
+                daily_count, max_amount, latest_date = conn.execute(
+                    QUALITY_QUERY, (day_start, day_end)
+                ).fetchone()
+            
+            # Check transaction count
+            min_threshold = self.config['quality_thresholds']['min_daily_transactions']
+            
+            if daily_count < min_threshold:
+                issue = f"Low transaction count today: {daily_count} (expected: >{min_threshold})"
+                quality_issues.append(issue)
+                self.logger.warning(issue)
+            
+            # Check for anomalous transaction amounts
+            max_amount = max_amount or 0
+            max_threshold = self.config['quality_thresholds']['max_transaction_amount']
+            
+            if max_amount > max_threshold:
+                issue = f"Unusually high transaction detected: ${max_amount:,.2f}"
+                quality_issues.append(issue)
+                self.logger.warning(issue)
+            
+            # Check data freshness
+            if latest_date:
+                latest_date = datetime.strptime(latest_date, '%Y-%m-%d')
+                hours_old = (datetime.now() - latest_date).total_seconds() / 3600
+                freshness_threshold = self.config['quality_thresholds']['data_freshness_hours']
                 
-                if max_amount > max_threshold:
-                    issue = f"Unusually high transaction detected: ${max_amount:,.2f}"
+                if hours_old > freshness_threshold:
+                    issue = f"Data is stale: {hours_old:.1f} hours old (threshold: {freshness_threshold}h)"
                     quality_issues.append(issue)
                     self.logger.warning(issue)
-                
-                # Check data freshness
-                result = pd.read_sql(
-                    "SELECT MAX(transaction_date) as latest_date FROM sales_transactions",
-                    conn
-                )
-                
-                if result.iloc[0]['latest_date']:
-                    latest_date = datetime.strptime(result.iloc[0]['latest_date'], '%Y-%m-%d')
-                    hours_old = (datetime.now() - latest_date).total_seconds() / 3600
-                    freshness_threshold = self.config['quality_thresholds']['data_freshness_hours']
-                    
-                    if hours_old > freshness_threshold:
-                        issue = f"Data is stale: {hours_old:.1f} hours old (threshold: {freshness_threshold}h)"
-                        quality_issues.append(issue)
-                        self.logger.warning(issue)
-                
+            
         except Exception as e:
             issue = f"Data quality check failed: {str(e)}"
             quality_issues.append(issue)
@@ -176,28 +339,213 @@ class SalesAutomationManager:
         
         return quality_issues
     
+    def run_etl_pipeline(self):
+        """Run the ETL pipeline followed by data quality checks"""
+        try:
+            self.etl.run()
+            self.logger.info("ETL pipeline run completed")
+        except Exception as e:
+            self.logger.error(f"ETL pipeline failed: {str(e)}")
+            self.send_alert("ETL Pipeline Failed", f"ETL pipeline run failed: {str(e)}")
+            return
+        finally:
+            # Even a failed load may have (re)created the table or changed rows, so
+            # restore the index and forget KPIs and reports built from the old data
+            self.ensure_schema()
+            self._kpi_cache = None
+            self._report_cache = None
+        
+        quality_issues = self.validate_data_quality()
+        if quality_issues:
+            self.send_alert("Data Quality Issues", "\n".join(quality_issues))
+    
+    def kpi_signature(self):
+        """Return (row count, latest transaction date), which changes whenever sales data is loaded"""
+        with self._reader() as conn:
+            return conn.execute(KPI_SIGNATURE_QUERY).fetchone()
+    
+    def generate_kpi_report(self, signature=None):
+        """Return the report KPIs, recomputing them only when the sales data has changed"""
+        if signature is None:
+            signature = self.kpi_signature()
+        
+        if self._kpi_cache is not None and self._kpi_cache[0] == signature:
+            return self._kpi_cache[1]
+        
+        report_data = self._query_kpis()
+        self._kpi_cache = (signature, report_data)
+        return report_data
+    
+    def _query_kpis(self):
+        """Compute the report KPIs with DuckDB, falling back to SQLite"""
+        global _duckdb_sqlite_unavailable
+        
+        if not _duckdb_sqlite_unavailable:
+            db_path = str(Path(self.config['database_path']).resolve()).replace("'", "''")
+            
+            # Never fetch extensions at run time; the sqlite extension must be
+            # installed ahead of time (see README)
+            with closing(duckdb.connect(config={'autoinstall_known_extensions': False})) as con:
+                try:
+                    con.execute("LOAD sqlite")
+                    con.execute(f"ATTACH '{db_path}' AS sales (TYPE sqlite, READ_ONLY)")
+                    con.execute("USE sales")
+                except duckdb.Error as e:
+                    _duckdb_sqlite_unavailable = True
+                    self.logger.warning(f"DuckDB sqlite extension unavailable, using SQLite for KPIs: {str(e)}")
+                else:
+                    try:
+                        # DuckDB scans the SQLite file with its vectorized engine and
+                        # hands results to pandas via Arrow
+                        return {name: duckdb_frame(con.execute(sql)) for name, sql in DUCKDB_KPI_QUERIES.items()}
+                    except duckdb.Error as e:
+                        self.logger.warning(f"DuckDB KPI query failed, using SQLite: {str(e)}")
+            
+        with self._reader() as conn:
+            return {name: pd.read_sql(sql, conn) for name, sql in KPI_QUERIES.items()}
+    
     def generate_performance_report(self):
         """Generate automated performance report"""
         try:
-            report_data = self.etl.generate_kpi_report()
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            # Create HTML report
-            html_report = f"""
-            <html>
-            <head><title>Sales Performance Report - {datetime.now().strftime('%Y-%m-%d')}</title></head>
-            <body style="font-family: Arial, sans-serif; margin: 40px;">
-                <h1>📊 Sales Performance Report</h1>
-                <p><strong>Generated:</strong> {timestamp}</p>
-                
-                <h2>📈 Revenue Trends</h2>
-                {report_data['revenue_trends'].to_html(index=False, table_id='revenue-table')}
-                
-                <h2>🏆 Top Products</h2>
-                {report_data['top_products'].head(10).to_html(index=False, table_id='products-table')}
+            # Reuse the report rendered earlier this hour if the sales data is unchanged
+            signature = self.kpi_signature()
+            cache_key = (datetime.now().strftime('%Y-%m-%d %H'), signature)
+            
+            if self._report_cache is not None and self._report_cache[0] == cache_key:
+                self.logger.info("Performance report unchanged since last run, reusing it")
+                return self._report_cache[1]
+            
+            report_data = self.generate_kpi_report(signature)
+            
+            # Same template the dashboard streams, rendered from the KPI DataFrames
+            html_report = ''.join(render_report(
+                lambda name: (report_data[name].columns, report_data[name].itertuples(index=False))
+            ))
+            
+            report_dir = Path(self.config['report_path'])
+            report_dir.mkdir(exist_ok=True)
+            
+            report_file = report_dir / f"performance_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
+            report_file.write_text(html_report, encoding='utf-8')
+            
+            self.logger.info(f"Performance report generated: {report_file}")
+            
+            self._report_cache = (cache_key, html_report)
+            return html_report
+            
+        except Exception as e:
+            self.logger.error(f"Report generation failed: {str(e)}")
+            self.send_alert("Report Generation Failed", f"Performance report generation failed: {str(e)}")
+            return None
+    
+    def send_alert(self, subject, message):
+        """Send email alert to configured recipients"""
+        email_config = self.config['email_alerts']
+        if not email_config.get('enabled'):
+            return
+        
+        try:
+            msg = MIMEMultipart()
+            msg['From'] = email_config['sender_email']
+            msg['To'] = ', '.join(email_config['recipients'])
+            msg['Subject'] = f"[Sales Pipeline] {subject}"
+            msg.attach(MIMEText(message, 'plain'))
+            
+            with smtplib.SMTP(email_config['smtp_server'], email_config['smtp_port']) as server:
+                server.starttls()
+                server.login(email_config['sender_email'], email_config['sender_password'])
+                server.send_message(msg)
                 
-                <h2>👥 Customer Segments</h2>
-                {report_data['customer_segments'].to_html(index=False, table_id='segments-table')}
+            self.logger.info(f"Alert sent: {subject}")
+            
+        except Exception as e:
+            self.logger.error(f"Failed to send alert: {str(e)}")
+    
+    def run_maintenance(self, task_names):
+        """Run the named tasks concurrently and wait for all of them to finish"""
+        futures = {self._pool.submit(getattr(self, name)): name for name in task_names}
+        wait(futures)
+        
+        for future, name in futures.items():
+            if future.exception() is not None:
+                self.logger.error(f"Scheduled task {name} failed: {str(future.exception())}")
+    
+    def start_scheduler(self):
+        """Schedule the ETL and maintenance jobs with persistent misfire handling"""
+        global _manager
+        _manager = self
+        
+        schedule_config = self.config['schedule']
+        jobs = {'etl': (['run_etl_pipeline'], schedule_config['etl_frequency'])}
+        
+        # One maintenance job per frequency
+        for task_name, setting in MAINTENANCE_TASKS.items():
+            frequency = schedule_config[setting]
+            jobs.setdefault(f"maintenance_{frequency}", ([], frequency))[0].append(task_name)
+        
+        # A single scheduler worker keeps the ETL job and the maintenance ticks
+        # from ever overlapping, even when they fall due at the same time
+        self.scheduler = BackgroundScheduler(
+            jobstores={'default': SQLAlchemyJobStore(url=self.config['scheduler_jobstore_url'])},
+            executors={'default': SchedulerThreadPool(1)}
+        )
+        
+        # Start paused so persisted jobs keep their next run time (and misfires are
+        # recovered on resume) instead of being replaced by freshly scheduled ones
+        self.scheduler.start(paused=True)
+        
+        for job in self.scheduler.get_jobs():
+            if job.id not in jobs:
+                # Left over from an earlier schedule configuration
+                self.scheduler.remove_job(job.id)
+        
+        for job_id, (task_names, frequency) in jobs.items():
+            job = self.scheduler.get_job(job_id)
+            
+            if job is not None and job.trigger.interval != timedelta(**SCHEDULE_INTERVALS[frequency]):
+                # Frequency changed in the config; reschedule from now
+                self.scheduler.remove_job(job_id)
+                job = None
+            
+            # No grace limit, so a run missed during an outage of any length is
+            # caught up on resume; coalesce folds several missed runs into one
+            if job is None:
+                self.scheduler.add_job(
+                    run_scheduled_tasks, 'interval', args=[task_names], id=job_id,
+                    max_instances=1, misfire_grace_time=None, coalesce=True,
+                    **SCHEDULE_INTERVALS[frequency]
+                )
+            elif list(job.args[0]) != task_names or job.misfire_grace_time is not None:
+                # Also lifts the 10-minute grace window stored with older jobs
+                self.scheduler.modify_job(job_id, args=[task_names], misfire_grace_time=None)
                 
-                <style>
-                    table {{ border
\ No newline at end of file
+            self.logger.info(f"Scheduled {', '.join(task_names)}: {frequency}")
+        
+        self.scheduler.resume()
+    
+    def close(self):
+        """Stop the scheduler, release database connections and flush logging"""
+        if self.scheduler is not None and self.scheduler.running:
+            self.scheduler.shutdown()
+            
+        self._pool.shutdown(wait=True)
+        
+        # Waits for any borrowed connection to be returned before closing it
+        for _ in range(MAINTENANCE_WORKERS):
+            self._ro_pool.get().close()
+            
+        # Flush any queued log records
+        self._log_listener.stop()
+
+
+if __name__ == '__main__':
+    manager = SalesAutomationManager()
+    manager.start_scheduler()
+    
+    try:
+        while True:
+            time.sleep(60)
+    except (KeyboardInterrupt, SystemExit):
+        manager.logger.info("Shutting down automation manager")
+    finally:
+        manager.close()
@@ -1,39 +1,125 @@
-from flask import Flask, jsonify
-import os
+from flask import Flask, request
+import orjson
+import time
+import hashlib
+import threading
+import sqlite3
 from datetime import datetime
+from contextlib import closing
+from cachetools import TTLCache
+
+from sales_db import connect_readonly, database_path
+from report_stream import stream_report_html
 
 app = Flask(__name__)
 
-@app.route('/')
-def dashboard():
-    return '''
+# SQLite database produced by the ETL pipeline, from the same config.json the
+# automation manager reads
+DATABASE_PATH = database_path()
+
+# Shown until the ETL pipeline has loaded the sales tables
+ETL_PENDING_MESSAGE = "Run ETL pipeline first to see real data"
+
+# /report body when the database cannot be queried yet
+REPORT_UNAVAILABLE = orjson.dumps({"message": ETL_PENDING_MESSAGE})
+
+# Seconds a /api/kpis response is served from cache (and may be cached by clients)
+KPI_CACHE_TTL = 30
+
+# Serialized /api/kpis bodies and their ETags, keyed by query parameters
+_kpi_cache = TTLCache(maxsize=8, ttl=KPI_CACHE_TTL)
+_kpi_cache_lock = threading.Lock()
+
+# Static parts of the status page around its timestamp, encoded once at import
+DASHBOARD_PREFIX = '''
     <html>
     <head><title>Sales Analytics Dashboard</title></head>
     <body style="font-family: Arial; margin: 40px;">
         <h1>📊 Sales Analytics Dashboard</h1>
         <p><strong>Status:</strong> <span style="color: green;">Running</span></p>
-        <p><strong>Time:</strong> ''' + datetime.now().strftime('%Y-%m-%d %H:%M:%S') + '''</p>
+        <p><strong>Time:</strong> '''.encode()
+
+DASHBOARD_SUFFIX = '''</p>
         <h3>Quick Links:</h3>
         <ul>
             <li><a href="/health">Health Check</a></li>
             <li><a href="/api/kpis">View KPIs</a></li>
+            <li><a href="/report">Performance Report</a></li>
         </ul>
     </body>
     </html>
-    '''
+    '''.encode()
+
+# (epoch second, display time, /health body), rebuilt at most once per second
+_clock = (0, b'', b'')
+
+def current_clock():
+    global _clock
+    now = int(time.time())
+    if now != _clock[0]:
+        # Swapped in as one tuple so concurrent readers never see a mixed state
+        _clock = (
+            now,
+            datetime.fromtimestamp(now).strftime('%Y-%m-%d %H:%M:%S').encode(),
+            orjson.dumps({"status": "healthy", "time": now})
+        )
+    return _clock
+
+@app.route('/')
+def dashboard():
+    return app.response_class(DASHBOARD_PREFIX + current_clock()[1] + DASHBOARD_SUFFIX, mimetype='text/html')
 
 @app.route('/health')
 def health():
-    return jsonify({"status": "healthy", "time": datetime.now().isoformat()})
+    return app.response_class(current_clock()[2], mimetype='application/json')
 
-@app.route('/api/kpis')
-def kpis():
-    return jsonify({
+def build_kpis():
+    return {
         "total_revenue": 0,
         "active_customers": 0,
-        "message": "Run ETL pipeline first to see real data"
-    })
+        "message": ETL_PENDING_MESSAGE
+    }
+
+@app.route('/api/kpis')
+def kpis():
+    cache_key = tuple(sorted(request.args.items(multi=True)))
+    
+    with _kpi_cache_lock:
+        cached = _kpi_cache.get(cache_key)
+        
+    if cached is None:
+        body = orjson.dumps(build_kpis())
+        cached = (hashlib.sha1(body).hexdigest(), body)
+        with _kpi_cache_lock:
+            _kpi_cache[cache_key] = cached
+    
+    etag, body = cached
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = f"max-age={KPI_CACHE_TTL}, stale-while-revalidate=60"
+    
+    # Answers 304 with an empty body when If-None-Match matches
+    return response.make_conditional(request)
+
+def stream_report(conn, chunks):
+    # The connection is closed once the last chunk has been sent (or the client
+    # disconnects)
+    with closing(conn):
+        yield from chunks
 
-if __name__ == '__main__':
-    print("🚀 Starting Dashboard at http://localhost:8050")
-    app.run(host='0.0.0.0', port=8050, debug=True)
\ No newline at end of file
+@app.route('/report')
+def report():
+    # Connect and run the first query before any bytes are sent, so a missing or
+    # not yet loaded database is a clean 503 instead of a truncated page
+    try:
+        conn = connect_readonly(DATABASE_PATH)
+    except sqlite3.Error:
+        return app.response_class(REPORT_UNAVAILABLE, status=503, mimetype='application/json')
+    
+    try:
+        chunks = stream_report_html(conn)
+    except sqlite3.Error:
+        conn.close()
+        return app.response_class(REPORT_UNAVAILABLE, status=503, mimetype='application/json')
+    
+    return app.response_class(stream_report(conn, chunks), mimetype='text/html')
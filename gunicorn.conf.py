@@ -0,0 +1,9 @@
+# Gunicorn settings for the sales analytics dashboard
+
+import multiprocessing
+
+bind = "0.0.0.0:8050"
+worker_class = "gthread"
+workers = multiprocessing.cpu_count()
+threads = 8
+keepalive = 5
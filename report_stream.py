@@ -0,0 +1,236 @@
+# Performance report rendering shared by the automation manager and the dashboard.
+# Kept free of the ETL, scheduler and pandas imports so the dashboard stays light.
+
+import html
+import math
+import numbers
+from datetime import datetime
+from itertools import islice
+
+# KPI rollups for the performance report, ported from analytics_queries.sql
+# (sections 1, 3 and 5). The date expressions differ between SQLite and DuckDB,
+# so they are filled in per engine from the dialect tables below. Growth rates
+# default to 0.0 rather than 0 so SQLite types the column as REAL on every row.
+KPI_QUERY_TEMPLATES = {
+    "revenue_trends": """
+        WITH monthly_revenue AS (
+            SELECT 
+                {year} as year,
+                {month} as month,
+                {year_month} as year_month,
+                SUM(total_amount) as revenue,
+                COUNT(*) as transaction_count,
+                COUNT(DISTINCT customer_id) as unique_customers,
+                AVG(total_amount) as avg_transaction_value
+            FROM sales_transactions
+            GROUP BY {year_month}
+        ),
+        revenue_growth AS (
+            SELECT *,
+                LAG(revenue, 1) OVER (ORDER BY year_month) as prev_month_revenue,
+                LAG(revenue, 12) OVER (ORDER BY year_month) as prev_year_revenue,
+                CASE 
+                    WHEN LAG(revenue, 1) OVER (ORDER BY year_month) IS NOT NULL 
+                    THEN (revenue - LAG(revenue, 1) OVER (ORDER BY year_month)) / LAG(revenue, 1) OVER (ORDER BY year_month) * 100
+                    ELSE 0.0 
+                END as mom_growth_rate,
+                CASE 
+                    WHEN LAG(revenue, 12) OVER (ORDER BY year_month) IS NOT NULL 
+                    THEN (revenue - LAG(revenue, 12) OVER (ORDER BY year_month)) / LAG(revenue, 12) OVER (ORDER BY year_month) * 100
+                    ELSE 0.0 
+                END as yoy_growth_rate
+            FROM monthly_revenue
+        )
+        SELECT * FROM revenue_growth ORDER BY year_month
+    """,
+    "top_products": """
+        SELECT 
+            p.category,
+            p.product_name,
+            p.brand,
+            SUM(st.quantity) as units_sold,
+            SUM(st.total_amount) as total_revenue,
+            COUNT(DISTINCT st.customer_id) as unique_buyers,
+            COUNT(*) as transaction_count,
+            AVG(st.total_amount) as avg_order_value,
+            ROUND(p.profit_margin, 2) as profit_margin,
+            ROUND(SUM(st.total_amount) * p.profit_margin / 100, 2) as estimated_profit
+        FROM sales_transactions st
+        JOIN products p ON st.product_id = p.product_id
+        GROUP BY p.product_id, p.category, p.product_name, p.brand, p.profit_margin
+        ORDER BY total_revenue DESC
+        LIMIT 50
+    """,
+    "customer_segments": """
+        WITH customer_rfm AS (
+            SELECT 
+                customer_id,
+                {days_since_last_purchase} as recency_days,
+                COUNT(*) as frequency,
+                SUM(total_amount) as monetary_value,
+                AVG(total_amount) as avg_order_value
+            FROM sales_transactions
+            GROUP BY customer_id
+        ),
+        rfm_scores AS (
+            SELECT *,
+                CASE 
+                    WHEN recency_days <= 30 THEN 5
+                    WHEN recency_days <= 60 THEN 4
+                    WHEN recency_days <= 90 THEN 3
+                    WHEN recency_days <= 180 THEN 2
+                    ELSE 1
+                END as recency_score,
+                CASE 
+                    WHEN frequency >= 20 THEN 5
+                    WHEN frequency >= 15 THEN 4
+                    WHEN frequency >= 10 THEN 3
+                    WHEN frequency >= 5 THEN 2
+                    ELSE 1
+                END as frequency_score,
+                CASE 
+                    WHEN monetary_value >= 5000 THEN 5
+                    WHEN monetary_value >= 2000 THEN 4
+                    WHEN monetary_value >= 1000 THEN 3
+                    WHEN monetary_value >= 500 THEN 2
+                    ELSE 1
+                END as monetary_score
+            FROM customer_rfm
+        ),
+        customer_segments AS (
+            SELECT *,
+                CASE 
+                    WHEN recency_score >= 4 AND frequency_score >= 4 AND monetary_score >= 4 THEN 'Champions'
+                    WHEN recency_score >= 3 AND frequency_score >= 3 AND monetary_score >= 3 THEN 'Loyal Customers'
+                    WHEN recency_score >= 4 AND frequency_score <= 2 THEN 'New Customers'
+                    WHEN recency_score <= 2 AND frequency_score >= 3 AND monetary_score >= 3 THEN 'At Risk'
+                    WHEN recency_score <= 2 AND frequency_score <= 2 THEN 'Lost Customers'
+                    ELSE 'Potential Loyalists'
+                END as customer_segment
+            FROM rfm_scores
+        )
+        SELECT 
+            customer_segment,
+            COUNT(*) as customer_count,
+            ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER(), 2) as percentage,
+            ROUND(AVG(monetary_value), 2) as avg_customer_value,
+            ROUND(AVG(frequency), 1) as avg_purchase_frequency,
+            ROUND(AVG(recency_days), 0) as avg_days_since_last_purchase
+        FROM customer_segments
+        GROUP BY customer_segment
+        ORDER BY customer_count DESC
+    """
+}
+
+SQLITE_DATE_EXPRESSIONS = {
+    "year": "strftime('%Y', transaction_date)",
+    "month": "strftime('%m', transaction_date)",
+    "year_month": "strftime('%Y-%m', transaction_date)",
+    "days_since_last_purchase": "julianday('now') - julianday(MAX(transaction_date))"
+}
+
+# The sqlite scanner exposes TEXT dates as VARCHAR, hence the casts; DuckDB also
+# requires non-grouped columns to be aggregated, hence any_value
+DUCKDB_DATE_EXPRESSIONS = {
+    "year": "any_value(strftime(CAST(transaction_date AS TIMESTAMP), '%Y'))",
+    "month": "any_value(strftime(CAST(transaction_date AS TIMESTAMP), '%m'))",
+    "year_month": "strftime(CAST(transaction_date AS TIMESTAMP), '%Y-%m')",
+    "days_since_last_purchase": "julian(CAST(current_timestamp AS TIMESTAMP)) - julian(MAX(CAST(transaction_date AS TIMESTAMP)))"
+}
+
+KPI_QUERIES = {name: sql.format(**SQLITE_DATE_EXPRESSIONS) for name, sql in KPI_QUERY_TEMPLATES.items()}
+DUCKDB_KPI_QUERIES = {name: sql.format(**DUCKDB_DATE_EXPRESSIONS) for name, sql in KPI_QUERY_TEMPLATES.items()}
+
+# Performance report sections: (KPI query name, heading, table id, row limit)
+REPORT_SECTIONS = (
+    ("revenue_trends", "📈 Revenue Trends", "revenue-table", None),
+    ("top_products", "🏆 Top Products", "products-table", 10),
+    ("customer_segments", "👥 Customer Segments", "segments-table", None)
+)
+
+REPORT_STYLE = """
+                <style>
+                    table { border-collapse: collapse; width: 100%; margin-bottom: 30px; }
+                    th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+                    th { background-color: #4CAF50; color: white; }
+                </style>
+"""
+
+# The one report template, in the pieces it is rendered (and streamed) in
+REPORT_HEAD = """
+            <html>
+            <head><title>Sales Performance Report - {date}</title></head>
+            <body style="font-family: Arial, sans-serif; margin: 40px;">
+                <h1>📊 Sales Performance Report</h1>
+                <p><strong>Generated:</strong> {timestamp}</p>
+"""
+
+REPORT_TABLE_HEAD = """
+                <h2>{heading}</h2>
+                <table id="{table_id}">
+<thead>{header}</thead>
+<tbody>
+"""
+
+REPORT_TABLE_FOOT = """</tbody>
+</table>
+"""
+
+REPORT_FOOT = REPORT_STYLE + """            </body>
+            </html>
+"""
+
+# Rows rendered per report chunk
+REPORT_STREAM_BATCH = 256
+
+def format_cell(value):
+    """Format a report value the same way whichever engine produced it"""
+    if value is None:
+        return ''
+    if isinstance(value, numbers.Integral):
+        return f"{value:,}"
+    if isinstance(value, numbers.Real):
+        # NaN is how pandas hands back SQL NULL in numeric columns
+        return '' if math.isnan(value) else f"{value:,.2f}"
+    return html.escape(str(value))
+
+def html_row(values, cell='td'):
+    """Render one HTML table row with formatted, escaped cell values"""
+    return '<tr>' + ''.join(f"<{cell}>{format_cell(value)}</{cell}>" for value in values) + '</tr>'
+
+def render_report(fetch_table):
+    """
+    Yield the performance report as HTML text chunks.
+    fetch_table(name) returns (column names, row iterable) for a REPORT_SECTIONS query
+    and is only called when that section is reached.
+    """
+    now = datetime.now()
+    yield REPORT_HEAD.format(date=now.strftime('%Y-%m-%d'), timestamp=now.strftime('%Y-%m-%d %H:%M:%S'))
+    
+    for name, heading, table_id, row_limit in REPORT_SECTIONS:
+        columns, rows = fetch_table(name)
+        yield REPORT_TABLE_HEAD.format(heading=heading, table_id=table_id, header=html_row(columns, 'th'))
+        
+        # Rows are pulled in batches, so memory stays flat however large the result set is
+        rows = islice(rows, row_limit)
+        while batch := list(islice(rows, REPORT_STREAM_BATCH)):
+            yield ''.join(html_row(row) + '\n' for row in batch)
+            
+        yield REPORT_TABLE_FOOT
+    
+    yield REPORT_FOOT
+
+def stream_report_html(conn):
+    """
+    Return an iterator of the performance report as UTF-8 HTML chunks straight
+    from SQLite cursors. The first section's query runs before this returns, so a
+    missing table raises sqlite3.Error here rather than partway through a response.
+    """
+    first_section = REPORT_SECTIONS[0][0]
+    cursors = {first_section: conn.execute(KPI_QUERIES[first_section])}
+    
+    def fetch_table(name):
+        cursor = cursors.pop(name, None) or conn.execute(KPI_QUERIES[name])
+        return [column[0] for column in cursor.description], cursor
+    
+    return (chunk.encode() for chunk in render_report(fetch_table))
@@ -0,0 +1,41 @@
+# SQLite connection and config plumbing shared by the automation manager and the dashboard
+
+import sqlite3
+import orjson
+from pathlib import Path
+
+# Where the pipeline keeps its settings, and the database used when none is configured
+CONFIG_FILE = 'config.json'
+DEFAULT_DATABASE_PATH = 'sales_data.db'
+
+# Connection PRAGMAs applied to every SQLite handle opened by the manager and the
+# dashboard. journal_mode is persisted in the database file, so only writers set it.
+SQLITE_PRAGMAS = """
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-20000;
+PRAGMA busy_timeout=5000;
+PRAGMA mmap_size=268435456;
+"""
+
+# Prepared-statement cache size for each connection (sqlite3 default is 128)
+SQLITE_CACHED_STATEMENTS = 256
+
+def database_path(config_file=CONFIG_FILE):
+    """Return the configured database path, read the same way SalesAutomationManager does"""
+    try:
+        return orjson.loads(Path(config_file).read_bytes()).get('database_path', DEFAULT_DATABASE_PATH)
+    except FileNotFoundError:
+        return DEFAULT_DATABASE_PATH
+    except Exception as e:
+        print(f"Error loading config: {e}. Using defaults.")
+        return DEFAULT_DATABASE_PATH
+
+def connect_readonly(db_path):
+    """Open a read-only SQLite connection with the standard PRAGMAs applied"""
+    conn = sqlite3.connect(
+        f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False,
+        cached_statements=SQLITE_CACHED_STATEMENTS
+    )
+    conn.executescript(SQLITE_PRAGMAS)
+    return conn
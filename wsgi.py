@@ -0,0 +1,4 @@
+# WSGI entry point for the sales analytics dashboard
+# Run with: gunicorn wsgi:app  (worker settings are read from gunicorn.conf.py)
+
+from dashboard_server import app